@@ -13,19 +13,23 @@ bl_info = {
 import sys
 import importlib
 
-# Import the classes from their respective modules
-from .bake_operator import AUTOBAKE_OT_BakeMaps 
-from .panel import AUTOBAKE_PT_Panel
-from .properties import AutoBakeProperties
-
-# List of classes to register
-classes = (
-    AUTOBAKE_OT_BakeMaps,
-    AUTOBAKE_PT_Panel,
-    AutoBakeProperties,
-)
+# List of classes to register, filled in by register() so enabling the add-on
+# is the first time the submodules get imported
+classes = None
 
 def register():
+    global classes
+    # Import the classes from their respective modules
+    from .bake_operator import AUTOBAKE_OT_BakeMaps
+    from .panel import AUTOBAKE_PT_Panel
+    from .properties import AutoBakeProperties
+
+    classes = (
+        AUTOBAKE_OT_BakeMaps,
+        AUTOBAKE_PT_Panel,
+        AutoBakeProperties,
+    )
+
     from bpy.utils import register_class
     # Register all classes
     for cls in classes:
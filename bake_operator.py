@@ -2,9 +2,57 @@
 
 import bpy
 import os
-import traceback # Import for detailed error logging
+import struct
+import zlib
+import concurrent.futures
+import numpy as np # Bundled with Blender
 from bpy.types import Operator
 
+# Cycles samples per map. Normal and Roughness are plain surface reads, only AO (and a bit of Diffuse) needs integration.
+BAKE_SAMPLES = {
+    'Diffuse': 4,
+    'Roughness': 1,
+    'Normal': 1,
+    'AO': 32,
+}
+
+def _write_png(filepath, pixels, compress_level=6):
+    """Writes an (height, width, channels) uint8 or uint16 array as an 8 or 16-bit PNG, top row first."""
+    height, width, channels = pixels.shape
+    bit_depth = pixels.dtype.itemsize * 8
+    color_type = {1: 0, 3: 2, 4: 6}[channels] # Grey, RGB, RGBA
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    # Every scanline uses filter type 2 (Up): the difference to the row above compresses much better than raw bytes
+    rows = pixels.reshape(height, -1)
+    if bit_depth == 16:
+        # PNG stores 16-bit samples big-endian, the filter then works on the individual bytes
+        rows = np.ascontiguousarray(rows, dtype='>u2').view(np.uint8)
+    scanlines = np.empty((height, rows.shape[1] + 1), dtype=np.uint8)
+    scanlines[:, 0] = 2
+    scanlines[:, 1:] = rows
+    scanlines[1:, 1:] -= rows[:-1] # uint8 wraps around, as the PNG filter expects
+
+    with open(filepath, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, bit_depth, color_type, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(scanlines, compress_level))) # zlib releases the GIL while compressing
+        f.write(chunk(b"IEND", b""))
+
+def _to_uint(pixels, dtype=np.uint8):
+    """Converts float pixels in 0-1 to uint8/uint16. Works in place on pixels, only the integer result is a new array."""
+    np.clip(pixels, 0.0, 1.0, out=pixels)
+    pixels *= np.iinfo(dtype).max
+    np.rint(pixels, out=pixels)
+    return pixels.astype(dtype)
+
+def _save_one(pixels, image_filepath, compress_level):
+    """Encodes and saves one baked image. Runs on a worker thread, must not touch bpy."""
+    # Blender stores rows bottom to top, PNG expects top to bottom
+    _write_png(image_filepath, pixels[::-1], compress_level)
+
 class AUTOBAKE_OT_BakeMaps(Operator):
     """Bakes selected maps for the active model using its active Principled BSDF material"""
     bl_idname = "autobake.bake_maps"
@@ -26,6 +74,9 @@ class AUTOBAKE_OT_BakeMaps(Operator):
             bake_normal = True
             bake_ao = True
             texture_size = 1024
+            subfolder_for_size = True
+            compression_speed = True
+            normal_as_exr = False
             output_folder = "//baked_textures" # Default to a relative path 'baked_textures' in the blend file's dir
 
         props = getattr(context.scene, "autobake_props", MockProps()) # Use mock props if real ones aren't registered
@@ -43,26 +94,59 @@ class AUTOBAKE_OT_BakeMaps(Operator):
         model = validRequirements['model']
         original_material = validRequirements['material'] # The material to bake from
 
+        # Resolve these RNA paths once, they are used all through the map loop
+        bake_settings = context.scene.render.bake
+        images_db = bpy.data.images
+
         # --- Store Original Settings ---
         original_engine = context.scene.render.engine
         original_render_samples = context.scene.cycles.samples # Use Render samples for 4.x+
-        original_use_selected_to_active = context.scene.render.bake.use_selected_to_active
+        original_use_selected_to_active = bake_settings.use_selected_to_active
+        original_use_persistent_data = context.scene.render.use_persistent_data
+        original_use_denoising = context.scene.cycles.use_denoising
+        has_bake_denoising = hasattr(bake_settings, "use_denoising") # Not present in every Blender version
+        if has_bake_denoising:
+            original_bake_use_denoising = bake_settings.use_denoising
         original_active_object = context.view_layer.objects.active
         original_selected_objects = context.selected_objects[:] # Store list copy
+        original_device = context.scene.cycles.device
+        cycles_prefs = self.get_cycles_preferences(context)
+        original_compute_device_type = cycles_prefs.compute_device_type if cycles_prefs else None
+        original_device_use = {} # Device id -> 'use' flag, filled by enable_gpu_device
+        uses_legacy_tiles = hasattr(context.scene.render, "tile_x") # Blender < 3.0 has per-axis tiles
+        if uses_legacy_tiles:
+            original_tile_size = (context.scene.render.tile_x, context.scene.render.tile_y)
+        else:
+            original_tile_size = context.scene.cycles.tile_size
+
+        nodes = original_material.node_tree.nodes
+        bake_node = None # Shared bake target node, removed once all maps are done
+        # Set before the try so the finally block can always use them
+        bake_successful = True
+        baked_images = {} # Images to save/remove, keyed by image name
+        output_path = None
 
         # --- Apply Bake Settings ---
         try:
             context.scene.render.engine = 'CYCLES'
-            # Set sample count for baking
-            bake_sample_count = 32 # Or props.bake_samples if made a property option later
-            context.scene.cycles.samples = bake_sample_count
-            print(f"Set Cycles Render Samples to {bake_sample_count} for baking.")
+            # Bake on the GPU when one is available, otherwise stay on CPU
+            self.enable_gpu_device(context, cycles_prefs, original_device_use)
+            self._configure_tiles_for_device(context.scene)
+            # Keep scene data (BVH, shaders) loaded between the map bakes instead of rebuilding it each time
+            context.scene.render.use_persistent_data = True
+
+            # Denoising would blur the baked data (normals, roughness) and costs time on every pass
+            context.scene.cycles.use_denoising = False
+            if has_bake_denoising:
+                bake_settings.use_denoising = False
 
             # We are baking the active object's own material
-            context.scene.render.bake.use_selected_to_active = False
+            bake_settings.use_selected_to_active = False
 
             # Ensure the correct object is selected and active
-            bpy.ops.object.select_all(action='DESELECT')
+            # Deselect directly instead of through the select_all operator (no operator overhead or undo push)
+            for obj in context.selected_objects[:]:
+                obj.select_set(False)
             context.view_layer.objects.active = model
             model.select_set(True)
 
@@ -71,23 +155,22 @@ class AUTOBAKE_OT_BakeMaps(Operator):
             if props.subfolder_for_size:
                 output_path = os.path.join(output_path, f"{props.texture_size}")
                 
-            if not os.path.exists(output_path):
-                print(f"Creating output directory: {output_path}")
-                os.makedirs(output_path)
+            # Creates the folder if needed, no separate existence check
+            os.makedirs(output_path, exist_ok=True)
 
             # Ensure the original material is assigned and active on the object
             if model.active_material != original_material:
-                found_material = False
-                for i, mat_slot in enumerate(model.material_slots):
-                    if mat_slot.material == original_material:
-                        model.active_material_index = i
-                        found_material = True
-                        print(f"Set active material index to {i} for '{original_material.name}'")
-                        break
-                if not found_material:
+                slot_index = {}
+                for i, slot in enumerate(model.material_slots):
+                    if slot.material:
+                        slot_index.setdefault(slot.material, i) # Keep the first slot if a material is used twice
+                try:
+                    model.active_material_index = slot_index[original_material]
+                except KeyError:
                     # This should ideally not happen if validation passed
                     self.report({'ERROR'}, f"Original material '{original_material.name}' not found in object slots.")
                     raise RuntimeError(f"Material '{original_material.name}' missing from object.")
+                print(f"Set active material index to {model.active_material_index} for '{original_material.name}'")
 
             if not model.active_material or model.active_material != original_material:
                  self.report({'ERROR'}, f"Could not set original material '{original_material.name}' active on model.")
@@ -101,8 +184,9 @@ class AUTOBAKE_OT_BakeMaps(Operator):
                 ('AO', props.bake_ao, self.bake_ao),
             ]
 
-            bake_successful = True
-            baked_images = [] # Keep track of images to save/remove
+            # One bake target node for all maps, only its image is swapped per map.
+            # Adding/removing nodes per map would force a shader recompile for every bake.
+            bake_node = self.add_bake_image_node(nodes, None)
 
             for map_type, should_bake, bake_method in map_types:
                 if not should_bake:
@@ -113,85 +197,149 @@ class AUTOBAKE_OT_BakeMaps(Operator):
                     # Create image
                     image_name = f"{model.name}_{map_type}"
                     # Ensure unique name if script run multiple times without reloading blend
-                    if image_name in bpy.data.images:
-                        bpy.data.images.remove(bpy.data.images[image_name])
+                    existing_image = images_db.get(image_name)
+                    if existing_image is not None:
+                        images_db.remove(existing_image)
 
                     image = self.create_image(image_name, props.texture_size, map_type)
-                    baked_images.append(image) # Add to list for later processing
+                    baked_images[image.name] = image # Track for later processing
+
+                    # Point the bake target node at this map's image
+                    bake_node.image = image
+                    nodes.active = bake_node
+
+                    # Sample count is picked per map, see BAKE_SAMPLES
+                    context.scene.cycles.samples = BAKE_SAMPLES[map_type]
+                    print(f"Set Cycles Render Samples to {BAKE_SAMPLES[map_type]} for {map_type}.")
 
                     # Call the specific bake method - pass original material
                     print(f"\n--- Starting Bake: {map_type} ---")
-                    bake_method(image, map_type, original_material)
+                    result = bake_method(image, map_type, original_material, bake_settings)
                     print(f"--- Finished Bake: {map_type} ---")
 
-                    # Optional: Check if the Normal map is a solid color
-                    if map_type == "Normal":
-                        if self.is_image_solid_color(image):
+                    # Optional: Check if the Normal map is a solid color.
+                    # Only worth the sample scan if the bake finished and the first pixel still looks untouched.
+                    if map_type == "Normal" and 'FINISHED' in result:
+                        if self.is_image_solid_color(image, expected_color=(0.5, 0.5, 1.0, 1.0)):
                              self.report({'WARNING'}, f"Normal map '{image.name}' may be solid color. Check geometry, normals, or material's Normal input.")
 
                 except Exception as e:
                     self.report({'ERROR'}, f"Failed during {map_type} bake: {str(e)}")
+                    import traceback # Imported lazily, only needed on errors
                     traceback.print_exc() # Print detailed error to console
-                    if image and image.name in bpy.data.images: # Check if image exists before removing
-                        bpy.data.images.remove(image)
-                        if image in baked_images:
-                            baked_images.remove(image) # Remove from our tracking list
+                    if image and images_db.get(image.name) is not None: # Check if image exists before removing
+                        baked_images.pop(image.name, None) # Stop tracking it, the name is gone once removed
+                        images_db.remove(image)
                     bake_successful = False
                     break # Stop baking further maps if one fails
 
             # --- Save Baked Images ---
             if bake_successful and baked_images:
                 print("\nSaving baked images...")
-                for image in baked_images:
-                     if image.name in bpy.data.images: # Check it still exists
+                # bpy is not thread safe, so pixels are read here on the main thread
+                # and only the PNG encoding/writing is handed to worker threads.
+                # image.save()/save_render() are deliberately not used for PNGs, they would
+                # encode one image at a time on the main thread.
+                # Baked maps are intermediates, trading a little file size for a much faster zlib encode
+                compress_level = 1 if props.compression_speed else 6
+                # Each map in flight holds a full size uint8 copy until it is written, so keep the count small
+                max_workers = min(len(baked_images), os.cpu_count() or 1, 4)
+                float_buffer = None # foreach_get target, reused for every map of the same size
+                with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {} # Future -> (image name, file path)
+                    for name, image in list(baked_images.items()):
+                        if images_db.get(name) is None: # Check it still exists
+                            print(f"Warning: Image '{name}' not found for saving (already removed?).")
+                            continue
+
                         image_filepath = os.path.join(output_path, f"{image.name}.png")
-                        image.filepath_raw = image_filepath
-                        image.file_format = 'PNG'
-                        # Color space should be set correctly during creation/baking
-                        # but double check before saving Normal map
-                        if image.name.endswith("_Normal"):
-                             if image.colorspace_settings.name != 'Non-Color':
-                                 print(f"Warning: Correcting colorspace to Non-Color for {image.name} before saving.")
-                                 image.colorspace_settings.name = 'Non-Color'
-
-                        try:
-                            image.save()
-                            print(f"Saved: {image_filepath}")
-                        except Exception as e:
-                             self.report({'ERROR'}, f"Failed to save image {image.name} to {image_filepath}: {e}")
-                             traceback.print_exc()
-                             bake_successful = False # Mark as failed if saving fails
-                     else:
-                        print(f"Warning: Image '{image.name}' not found for saving (already removed?).")
+                        # Color space is already Non-Color for the Normal map, create_image/bake_normal set it.
+                        # Keep the full float precision of the Normal map, Blender writes the EXR itself
+                        if props.normal_as_exr and image.use_generated_float and image.name.endswith("_Normal"):
+                            image_filepath = os.path.join(output_path, f"{image.name}.exr")
+                            try:
+                                self.save_image_exr(context.scene, image, image_filepath)
+                                print(f"Saved: {image_filepath}")
+                            except Exception as e:
+                                self.report({'ERROR'}, f"Failed to save image {image.name} to {image_filepath}: {e}")
+                                import traceback
+                                traceback.print_exc()
+                                bake_successful = False # Mark as failed if saving fails
+                            continue
+
+                        # Wait for a free worker before reading the next map
+                        if len(futures) >= max_workers:
+                            done, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                            if not self.finish_png_saves(futures, done):
+                                bake_successful = False
+
+                        width, height = image.size
+                        channels = image.channels
+                        if float_buffer is None or float_buffer.size != width * height * channels:
+                            float_buffer = np.empty(width * height * channels, dtype=np.float32)
+                        image.pixels.foreach_get(float_buffer)
+                        # The Normal map is baked into a float buffer, keep more of that precision with a 16-bit PNG
+                        dtype = np.uint16 if image.use_generated_float and image.name.endswith("_Normal") else np.uint8
+                        pixels = _to_uint(float_buffer, dtype).reshape(height, width, channels)
+                        futures[executor.submit(_save_one, pixels, image_filepath, compress_level)] = (image.name, image_filepath)
+                        del pixels # The worker owns the only reference now
+
+                    if not self.finish_png_saves(futures, list(futures)):
+                        bake_successful = False
 
 
         except Exception as e:
              # Catch errors during setup phase
              self.report({'ERROR'}, f"Error during bake setup: {str(e)}")
+             import traceback
              traceback.print_exc()
              bake_successful = False
 
         finally:
+            # --- Remove the bake target node ---
+            if bake_node:
+                self.remove_bake_image_node(nodes)
+
             # --- Clean up Blender Image Data ---
             print("Cleaning up baked images from Blender session...")
-            for image in baked_images:
-                if image and image.name in bpy.data.images:
+            for name, image in list(baked_images.items()):
+                if image and images_db.get(name) is not None:
                      try:
                          print(f"Removed image '{image.name}' from .blend data.")
-                         bpy.data.images.remove(image)
+                         images_db.remove(image)
                      except Exception as e:
-                         print(f"Warning: Could not remove image {image}: {e}")
+                         print(f"Warning: Could not remove image {name}: {e}")
 
 
             # --- Restore Original Settings ---
             print("Restoring original settings...")
             context.scene.render.engine = original_engine
             context.scene.cycles.samples = original_render_samples # Restore render samples
-            context.scene.render.bake.use_selected_to_active = original_use_selected_to_active
-            print(f"Restored Render Engine to '{original_engine}', Samples to {original_render_samples}.")
+            bake_settings.use_selected_to_active = original_use_selected_to_active
+            context.scene.render.use_persistent_data = original_use_persistent_data
+            context.scene.cycles.use_denoising = original_use_denoising
+            if has_bake_denoising:
+                bake_settings.use_denoising = original_bake_use_denoising
+            context.scene.cycles.device = original_device
+            if uses_legacy_tiles:
+                context.scene.render.tile_x, context.scene.render.tile_y = original_tile_size
+            else:
+                context.scene.cycles.tile_size = original_tile_size
+            if cycles_prefs and original_compute_device_type is not None:
+                try:
+                    cycles_prefs.compute_device_type = original_compute_device_type
+                except TypeError as e:
+                    print(f"Warning: Could not restore compute device type '{original_compute_device_type}': {e}")
+            if cycles_prefs and original_device_use:
+                # These are user preferences, don't leave our device selection behind
+                for device in cycles_prefs.devices:
+                    if device.id in original_device_use:
+                        device.use = original_device_use[device.id]
+            print(f"Restored Render Engine to '{original_engine}', Samples to {original_render_samples}, Device to '{original_device}'.")
 
             # Reselect originally selected objects and activate the original active object
-            bpy.ops.object.select_all(action='DESELECT')
+            for obj in context.selected_objects[:]:
+                obj.select_set(False)
             for obj in original_selected_objects:
                 if obj and obj.name in context.view_layer.objects: # Check if object still exists
                     obj.select_set(True)
@@ -250,6 +398,7 @@ class AUTOBAKE_OT_BakeMaps(Operator):
                 except Exception as e:
                     # This might happen if the layer is invalid somehow
                     self.report({'ERROR'}, f"Failed to set active_render on UV layer '{first_layer.name}': {e}")
+                    import traceback
                     traceback.print_exc()
                     return {'status': {'CANCELLED'}}
             else:
@@ -311,6 +460,63 @@ class AUTOBAKE_OT_BakeMaps(Operator):
             # we just need to ensure one *is* set for render.
         }
         
+    def get_cycles_preferences(self, context):
+        """Returns the Cycles add-on preferences, or None if Cycles is not available."""
+        cycles_addon = context.preferences.addons.get('cycles')
+        if not cycles_addon:
+            print("Warning: Cycles add-on preferences not found, GPU baking unavailable.")
+            return None
+        return cycles_addon.preferences
+
+    def enable_gpu_device(self, context, cycles_prefs, original_device_use):
+        """Switches Cycles to the first working GPU backend. Falls back to CPU if none is found.
+
+        The previous 'use' flag of every device that gets enabled is stored in original_device_use (keyed by device id).
+        """
+        if not cycles_prefs:
+            context.scene.cycles.device = 'CPU'
+            return False
+
+        # Try backends from fastest to most generic, not every one is valid on every platform
+        for device_type in ('OPTIX', 'CUDA', 'HIP', 'ONEAPI', 'METAL'):
+            try:
+                cycles_prefs.compute_device_type = device_type
+            except TypeError:
+                continue # Backend not supported by this build/platform
+
+            # get_devices() refreshes every backend at once, so only count devices of this one
+            cycles_prefs.get_devices()
+            gpu_devices = [device for device in cycles_prefs.devices if device.type == device_type]
+            if not gpu_devices:
+                continue
+
+            for device in cycles_prefs.devices:
+                if device.type in (device_type, 'CPU'): # Enable the GPUs, and the CPU alongside them
+                    original_device_use.setdefault(device.id, device.use)
+                    device.use = True
+            context.scene.cycles.device = 'GPU'
+            print(f"Baking on GPU using {device_type}: {', '.join(device.name for device in gpu_devices)}")
+            return True
+
+        context.scene.cycles.device = 'CPU'
+        print("No supported GPU found, baking on CPU.")
+        return False
+
+    def _configure_tiles_for_device(self, scene):
+        """Picks a tile size suited to the chosen Cycles device."""
+        is_gpu = scene.cycles.device == 'GPU'
+        if hasattr(scene.render, "tile_x"):
+            # Blender < 3.0: GPUs need big tiles to stay busy, CPUs prefer small ones
+            tile_size = 256 if is_gpu else 32
+            scene.render.tile_x = tile_size
+            scene.render.tile_y = tile_size
+            print(f"Set render tiles to {tile_size}x{tile_size} for {scene.cycles.device} baking.")
+        elif is_gpu:
+            # Blender 3.0+: a single tile size, large tiles keep the GPU fed.
+            # CPU baking is left at the scene's own tile size.
+            scene.cycles.tile_size = 2048
+            print("Set Cycles tile size to 2048 for GPU baking.")
+
     def create_image(self, name, size, map_type):
         """Creates a new image buffer for baking with appropriate settings."""
         print(f"Creating image: {name} ({size}x{size})")
@@ -336,8 +542,11 @@ class AUTOBAKE_OT_BakeMaps(Operator):
 
         return image
 
-    def is_image_solid_color(self, image):
-        """Checks if all pixels in the image have roughly the same color."""
+    def is_image_solid_color(self, image, max_samples=4096, expected_color=None):
+        """Checks if a sample of up to max_samples pixels all have roughly the same color.
+
+        If expected_color is given, an image whose first pixel doesn't match it is reported as not solid right away.
+        """
         print("Checking if image is solid color...")
         print(f"Image '{image.name}': Size={image.size}, Channels={image.channels}, Has Data={image.has_data}")
         width, height = image.size
@@ -348,39 +557,82 @@ class AUTOBAKE_OT_BakeMaps(Operator):
             return False # Cannot determine or empty
 
         try:
-            pixels = image.pixels[:] # Get a copy of the pixel data
-            if not pixels:
-                print(f"Image '{image.name}' pixels list is empty.")
-                return True # Empty image is technically solid?
-
             channels = image.channels
             if channels == 0: return True
 
-            first_pixel_color = pixels[0:channels]
             tolerance = 0.01 # Allow slight floating point variations
 
-            # Compare every pixel's color to the first one
-            for i in range(channels, len(pixels), channels):
-                current_pixel_color = pixels[i:i + channels]
-                if len(current_pixel_color) != channels: continue # Should not happen
-
-                # Compare channel by channel with tolerance
-                is_different = False
-                for j in range(channels):
-                    if abs(first_pixel_color[j] - current_pixel_color[j]) > tolerance:
-                        is_different = True
-                        break # This pixel is different
-                if is_different:
-                     # print(f"Debug: Pixel {i//channels} differs. First={first_pixel_color}, Current={current_pixel_color}")
-                     return False # Found a different pixel
-
-            print(f"Image '{image.name}' appears to be a solid color ({first_pixel_color}).")
-            return True # All pixels matched the first one within tolerance
+            pixel_count = width * height
+            # Read straight into a float32 buffer, avoids building a Python tuple of every float
+            pixels = np.empty(pixel_count * channels, dtype=np.float32)
+            image.pixels.foreach_get(pixels)
+            pixels = pixels.reshape(-1, channels)
+
+            # Cheap early outs on the buffer we already have. Slicing image.pixels would copy the whole image each time.
+            if expected_color is not None and np.abs(pixels[0] - expected_color[:channels]).max() > tolerance:
+                return False
+            corners = pixels[[0, width - 1, (height - 1) * width, pixel_count - 1]]
+            if np.ptp(corners, axis=0).max() > tolerance:
+                return False
+
+            # This is only a heuristic, a sparse sample of the pixels is enough to spot variation
+            if pixel_count <= max_samples:
+                sample = pixels
+            else:
+                # A fixed stride lines up with power-of-two widths and only ever hits a few columns,
+                # so sample at seeded random positions instead
+                indices = np.random.default_rng(0).integers(0, pixel_count, max_samples)
+                sample = pixels[indices]
+
+            # Largest per-channel spread across the sample
+            if np.ptp(sample, axis=0).max() > tolerance:
+                return False # Found a different pixel
+
+            print(f"Image '{image.name}' appears to be a solid color ({tuple(sample[0])}).")
+            return True # All sampled pixels matched within tolerance
         except Exception as e:
              print(f"Error checking if image '{image.name}' is solid color: {e}")
+             import traceback
              traceback.print_exc()
              return False # Assume not solid if check fails
 
+    def finish_png_saves(self, futures, done):
+        """Reports the result of the finished PNG saves in done and drops them from futures. Returns False if any failed."""
+        success = True
+        for future in done:
+            image_name, image_filepath = futures.pop(future)
+            try:
+                future.result()
+                print(f"Saved: {image_filepath}")
+            except Exception as e:
+                self.report({'ERROR'}, f"Failed to save image {image_name} to {image_filepath}: {e}")
+                import traceback
+                traceback.print_exception(type(e), e, e.__traceback__)
+                success = False
+        return success
+
+    def save_image_exr(self, scene, image, filepath):
+        """Saves an image as a ZIPS compressed 32-bit OpenEXR through the scene's output settings."""
+        image_settings = scene.render.image_settings
+        # The format goes back first: the original color depth is only valid for the original format
+        # (EXR rejects '8'), and Blender would otherwise pick its own depth when the format switches back
+        original_settings = (
+            ('file_format', image_settings.file_format),
+            ('color_depth', image_settings.color_depth),
+            ('exr_codec', image_settings.exr_codec),
+        )
+        try:
+            image_settings.file_format = 'OPEN_EXR'
+            image_settings.color_depth = '32'
+            image_settings.exr_codec = 'ZIPS' # Scanline ZIP, fast to write and read back
+            image.save_render(filepath, scene=scene)
+        finally:
+            for attribute, value in original_settings:
+                try:
+                    setattr(image_settings, attribute, value)
+                except TypeError as e:
+                    print(f"Warning: Could not restore output setting {attribute} '{value}': {e}")
+
     def add_bake_image_node(self, nodes, image):
         """Adds, selects, and activates an Image Texture node for baking."""
         bake_node_name = "BakeTargetNode"
@@ -392,14 +644,14 @@ class AUTOBAKE_OT_BakeMaps(Operator):
 
         image_node = nodes.new("ShaderNodeTexImage")
         image_node.name = bake_node_name
-        image_node.label = f"Bake Target ({image.name})" # Set label for clarity in UI
-        image_node.image = image
+        image_node.label = f"Bake Target ({image.name})" if image else "Bake Target" # Set label for clarity in UI
+        image_node.image = image # May be None, the image is then bound per map
         # Important: Set interpolation to closest for data maps to avoid blurring pixels
         # Or leave as linear? Linear is default. Maybe check map_type here if needed.
         # image_node.interpolation = 'Closest'
         image_node.select = True
         nodes.active = image_node # Make it the active node
-        print(f"Added/Activated Image Texture node '{image_node.name}' for image '{image.name}'")
+        print(f"Added/Activated Image Texture node '{image_node.name}' for image '{image.name if image else None}'")
         return image_node
 
     def remove_bake_image_node(self, nodes):
@@ -415,105 +667,65 @@ class AUTOBAKE_OT_BakeMaps(Operator):
     # --- Specific Bake Methods ---
     # Note: Passing 'self' to these methods now
 
-    def bake_diffuse(self, image, map_type, material):
+    def bake_diffuse(self, image, map_type, material, bake_settings):
         """Bakes the Diffuse Color map."""
-        nodes = material.node_tree.nodes
-        image_node = None
-        try:
-            image_node = self.add_bake_image_node(nodes, image) # Use helper
-
-            # Configure Diffuse bake settings
-            bake_type = 'DIFFUSE'
-            bpy.context.scene.render.bake.use_pass_direct = False   # Don't include direct light
-            bpy.context.scene.render.bake.use_pass_indirect = False # Don't include indirect light
-            bpy.context.scene.render.bake.use_pass_color = True     # Only bake the color info
+        # Configure Diffuse bake settings
+        bake_type = 'DIFFUSE'
+        bake_settings.use_pass_direct = False   # Don't include direct light
+        bake_settings.use_pass_indirect = False # Don't include indirect light
+        bake_settings.use_pass_color = True     # Only bake the color info
 
-            # Perform bake
-            print(f"Baking {map_type} with type {bake_type} (Color only)")
-            bpy.ops.object.bake(type=bake_type)
+        # Perform bake
+        print(f"Baking {map_type} with type {bake_type} (Color only)")
+        return bpy.ops.object.bake(type=bake_type)
 
-        finally:
-            # Clean up the added image node
-            if image_node:
-                self.remove_bake_image_node(nodes) # Use helper
-
-    def bake_normal(self, image, map_type, material):
+    def bake_normal(self, image, map_type, material, bake_settings):
         """Bakes the Tangent Space Normal map."""
-        nodes = material.node_tree.nodes
-        image_node = None
-        try:
-            # Ensure color space is correct *before* adding node/baking
-            if image.colorspace_settings.name != 'Non-Color':
-                 print(f"Warning: Setting colorspace to Non-Color for Normal map '{image.name}'")
-                 image.colorspace_settings.name = 'Non-Color'
-            if not image.use_generated_float:
-                 print(f"Warning: Enabling 32-bit float for Normal map '{image.name}'")
-                 image.use_generated_float = True
-
-            image_node = self.add_bake_image_node(nodes, image)
-
-            # Configure Normal bake settings
-            bake_type = 'NORMAL'
-            bpy.context.scene.render.bake.normal_space = 'TANGENT' # Standard for game engines
-            bpy.context.scene.render.bake.normal_r = 'POS_X'
-            bpy.context.scene.render.bake.normal_g = 'POS_Y'
-            bpy.context.scene.render.bake.normal_b = 'POS_Z'
-
-            # Perform bake
-            print(f"Baking {map_type} with type {bake_type} (Tangent Space)")
-            bpy.ops.object.bake(type=bake_type)
-
-        finally:
-            # Clean up the added image node
-            if image_node:
-                self.remove_bake_image_node(nodes)
-
-    def bake_roughness(self, image, map_type, material):
+        # Ensure color space is correct *before* baking
+        if image.colorspace_settings.name != 'Non-Color':
+             print(f"Warning: Setting colorspace to Non-Color for Normal map '{image.name}'")
+             image.colorspace_settings.name = 'Non-Color'
+        if not image.use_generated_float:
+             print(f"Warning: Enabling 32-bit float for Normal map '{image.name}'")
+             image.use_generated_float = True
+
+        # Configure Normal bake settings
+        bake_type = 'NORMAL'
+        bake_settings.normal_space = 'TANGENT' # Standard for game engines
+        bake_settings.normal_r = 'POS_X'
+        bake_settings.normal_g = 'POS_Y'
+        bake_settings.normal_b = 'POS_Z'
+
+        # Perform bake
+        print(f"Baking {map_type} with type {bake_type} (Tangent Space)")
+        return bpy.ops.object.bake(type=bake_type)
+
+    def bake_roughness(self, image, map_type, material, bake_settings):
         """Bakes the Roughness map."""
-        nodes = material.node_tree.nodes
-        image_node = None
-        try:
-             # Ensure non-color data
-            if image.colorspace_settings.name != 'Non-Color':
-                 print(f"Warning: Setting colorspace to Non-Color for Roughness map '{image.name}'")
-                 image.colorspace_settings.name = 'Non-Color'
+        # Ensure non-color data
+        if image.colorspace_settings.name != 'Non-Color':
+             print(f"Warning: Setting colorspace to Non-Color for Roughness map '{image.name}'")
+             image.colorspace_settings.name = 'Non-Color'
 
-            image_node = self.add_bake_image_node(nodes, image)
+        # Configure Roughness bake settings
+        bake_type = 'ROUGHNESS'
 
-            # Configure Roughness bake settings
-            bake_type = 'ROUGHNESS'
+        # Perform bake
+        print(f"Baking {map_type} with type {bake_type}")
+        return bpy.ops.object.bake(type=bake_type)
 
-            # Perform bake
-            print(f"Baking {map_type} with type {bake_type}")
-            bpy.ops.object.bake(type=bake_type)
-
-        finally:
-            # Clean up the added image node
-            if image_node:
-                self.remove_bake_image_node(nodes)
-
-    def bake_ao(self, image, map_type, material):
+    def bake_ao(self, image, map_type, material, bake_settings):
         """Bakes the Ambient Occlusion map."""
-        nodes = material.node_tree.nodes
-        image_node = None
-        try:
-             # Ensure non-color data
-            if image.colorspace_settings.name != 'Non-Color':
-                 print(f"Warning: Setting colorspace to Non-Color for AO map '{image.name}'")
-                 image.colorspace_settings.name = 'Non-Color'
-
-            image_node = self.add_bake_image_node(nodes, image)
-
-            # Configure AO bake settings
-            bake_type = 'AO'
-            # Optional: AO settings in World properties might influence this bake
-            # e.g., context.scene.world.light_settings.distance for AO distance
-
-            # Perform bake
-            print(f"Baking {map_type} with type {bake_type}")
-            bpy.ops.object.bake(type=bake_type)
-
-        finally:
-            # Clean up the added image node
-            if image_node:
-                 self.remove_bake_image_node(nodes)
+        # Ensure non-color data
+        if image.colorspace_settings.name != 'Non-Color':
+             print(f"Warning: Setting colorspace to Non-Color for AO map '{image.name}'")
+             image.colorspace_settings.name = 'Non-Color'
+
+        # Configure AO bake settings
+        bake_type = 'AO'
+        # Optional: AO settings in World properties might influence this bake
+        # e.g., context.scene.world.light_settings.distance for AO distance
+
+        # Perform bake
+        print(f"Baking {map_type} with type {bake_type}")
+        return bpy.ops.object.bake(type=bake_type)
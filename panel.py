@@ -17,6 +17,8 @@ class AUTOBAKE_PT_Panel(Panel):
         layout.prop(props, "texture_size")
         layout.prop(props, "output_folder")
         layout.prop(props, "subfolder_for_size")
+        layout.prop(props, "compression_speed")
+        layout.prop(props, "normal_as_exr")
 
         layout.label(text="Maps to Bake")
         layout.prop(props, "bake_diffuse", text="Diffuse")
@@ -20,6 +20,16 @@ class AutoBakeProperties(PropertyGroup):
         subtype='DIR_PATH'
     )
     subfolder_for_size: BoolProperty(name="Create subfolder for size", default=True)
+    compression_speed: BoolProperty(
+        name="Fast Compression",
+        description="Use a low PNG compression level. Saves faster, files are slightly larger",
+        default=True
+    )
+    normal_as_exr: BoolProperty(
+        name="Normal as EXR",
+        description="Save the Normal map as a 32-bit OpenEXR (ZIPS) instead of a 16-bit PNG",
+        default=False
+    )
     bake_diffuse: BoolProperty(name="Diffuse", default=True)
     bake_roughness: BoolProperty(name="Roughness", default=True)
     bake_normal: BoolProperty(name="Normal", default=True)